@@ -1,10 +1,24 @@
-import json
-import azure.functions as func
+import asyncio
 
-from backend.common import get_openai_client, verify_signature
+from backend.common import get_openai_client, signed_json_handler
+
+
+_inflight: dict[str, asyncio.Task] = {}
 
 
 async def check(message: str) -> str | None:
+    if not message.strip():
+        return None
+    # Concurrent retries of the same message share one moderation call.
+    task = _inflight.get(message)
+    if task is None:
+        task = asyncio.ensure_future(_moderate(message))
+        _inflight[message] = task
+        task.add_done_callback(lambda _: _inflight.pop(message, None))
+    return await asyncio.shield(task)
+
+
+async def _moderate(message: str) -> str | None:
     client = get_openai_client()
     resp = await client.moderations.create(input=message)
     cats = resp.results[0].categories
@@ -15,14 +29,6 @@ async def check(message: str) -> str | None:
     return None
 
 
-async def main(req: func.HttpRequest) -> func.HttpResponse:
-    sig = req.headers.get("OpenAI-Signature")
-    if not verify_signature(req.get_body(), sig):
-        return func.HttpResponse("forbidden", status_code=403)
-    try:
-        payload = req.get_json()
-    except ValueError:
-        return func.HttpResponse("invalid json", status_code=400)
-    flag = await check(str(payload.get("message", "")))
-    body = json.dumps({"status": "ok", "flag": flag})
-    return func.HttpResponse(body, mimetype="application/json")
+@signed_json_handler
+async def main(payload: dict) -> dict:
+    return {"flag": await check(str(payload.get("message", "")))}
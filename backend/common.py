@@ -2,51 +2,119 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import datetime as _dt
 import hmac
 import hashlib
+from typing import Any, Awaitable, Callable
 
+import azure.functions as func
 import httpx
+import orjson
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
-load_dotenv()
+# Every hosted Functions plan sets WEBSITE_SITE_NAME (Consumption, Flex,
+# Premium, Dedicated); only local runs look for a .env file.
+if os.getenv("WEBSITE_SITE_NAME") is None:
+    load_dotenv()
+
+_OPENAI_TIMEOUT = os.getenv("OPENAI_TIMEOUT", "15")
+_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+_NOCODB_API_URL = os.getenv("NOCODB_API_URL")
+_NOCODB_API_KEY = os.getenv("NOCODB_API_KEY")
+
+# Shared across warm invocations and never closed explicitly: their sockets
+# belong to the worker's event loop, and process exit reclaims them.
+_openai_client: AsyncOpenAI | None = None
+_http_client: httpx.AsyncClient | None = None
+
+_SIGNING_KEY = os.getenv("OPENAI_SIGNING_KEY")
+_SIGNING_KEY_BYTES = _SIGNING_KEY.encode() if _SIGNING_KEY else None
 
 
 def get_openai_client() -> AsyncOpenAI:
-    """Return an OpenAI client using env vars."""
-    timeout = int(os.getenv("OPENAI_TIMEOUT", "15"))
-    api_key = os.getenv("OPENAI_API_KEY")
-    return AsyncOpenAI(api_key=api_key, timeout=timeout)
+    """Return the shared OpenAI client, creating it from env vars on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=_OPENAI_API_KEY, timeout=int(_OPENAI_TIMEOUT)
+        )
+    return _openai_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive HTTP client for outbound REST calls."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=10,
+            # Only takes effect for https URLs (negotiated via ALPN); lets
+            # concurrent upserts multiplex over one connection.
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+        )
+    return _http_client
 
 
 async def nocodb_upsert(session_id: str, summary: str) -> None:
     """Upsert summary record into the NocoDB table."""
-    base = os.getenv("NOCODB_API_URL")
-    key = os.getenv("NOCODB_API_KEY")
-    if not base or not key:
+    if not _NOCODB_API_URL or not _NOCODB_API_KEY:
         raise RuntimeError("NocoDB configuration missing")
 
-    headers = {"xc-token": key, "Content-Type": "application/json"}
+    headers = {"xc-token": _NOCODB_API_KEY, "Content-Type": "application/json"}
     payload = {
         "session_id": session_id,
         "summary": summary,
         "updated_at": _dt.datetime.utcnow().isoformat(),
     }
-    async with httpx.AsyncClient(timeout=10) as client:
-        url = f"{base}/summaries"
-        resp = await client.post(url, json=payload, headers=headers)
-        if resp.status_code == 409:
-            await client.patch(f"{url}/{session_id}", json=payload, headers=headers)
-        else:
-            resp.raise_for_status()
+    client = get_http_client()
+    url = f"{_NOCODB_API_URL}/summaries"
+    resp = await client.post(url, json=payload, headers=headers)
+    if resp.status_code == 409:
+        await client.patch(f"{url}/{session_id}", json=payload, headers=headers)
+    else:
+        resp.raise_for_status()
 
 
 def verify_signature(body: bytes, signature: str | None) -> bool:
     """Optional verification for OpenAI-Signature header."""
-    secret = os.getenv("OPENAI_SIGNING_KEY")
-    if not secret or not signature:
+    if _SIGNING_KEY_BYTES is None or not signature:
         return True
-    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    if not signature.isascii():
+        return False
+    digest = hmac.new(_SIGNING_KEY_BYTES, body, hashlib.sha256).hexdigest()
     return hmac.compare_digest(digest, signature)
+
+
+def signed_json_handler(
+    fn: Callable[[dict], dict | func.HttpResponse | Awaitable[dict | func.HttpResponse]],
+) -> Callable[[func.HttpRequest], Awaitable[func.HttpResponse]]:
+    """Wrap a payload handler with signature check and JSON (de)serialisation.
+
+    The handler receives the parsed body and returns the fields to send
+    alongside ``"status": "ok"``, or an ``HttpResponse`` to reply as-is.
+    """
+    is_async = asyncio.iscoroutinefunction(fn)
+
+    # No functools.wraps: the worker binds on the signature, which must stay
+    # ``(req)`` rather than the wrapped ``(payload)``.
+    async def main(req: func.HttpRequest) -> func.HttpResponse:
+        body = req.get_body()
+        if not verify_signature(body, req.headers.get("OpenAI-Signature")):
+            return func.HttpResponse("forbidden", status_code=403)
+        try:
+            payload = orjson.loads(body)
+        except ValueError:
+            return func.HttpResponse("invalid json", status_code=400)
+        result: Any = await fn(payload) if is_async else fn(payload)
+        if isinstance(result, func.HttpResponse):
+            return result
+        return func.HttpResponse(
+            orjson.dumps({"status": "ok", **result}),
+            mimetype="application/json",
+        )
+
+    main.__doc__ = fn.__doc__
+    return main